@@ -1,47 +1,176 @@
-import argparse
-import json
-import logging
-from typing import Dict, Any, List, Optional, Tuple
+from __future__ import annotations
 
-import requests
-import sys
+import argparse
+import functools
 import os
+import re
+import sys
 import time
-from dotenv import load_dotenv
-import questionary
-import yaml
-import signal
 
+# Only argparse, os and sys are needed to parse arguments (argparse already
+# loads re and functools, and time is built in). Everything else, including the standard
+# library modules below, is imported where it is used so that --help and
+# --version return without loading it.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import queue
+    from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+    import httpx
+    import requests
 
-logging.basicConfig(level=logging.ERROR)
+
+__version__ = "0.1.0"
 
 DEFAULT_OUTPUT_DIR = "promptql_threads"
+# Downloads are I/O bound, so use several workers per CPU
+DEFAULT_CONCURRENCY = min(32, (os.cpu_count() or 4) * 4)
+DEFAULT_CACHE_DIR = "~/.promptql_cache"
+# (connect, read) timeouts in seconds for API requests
+REQUEST_TIMEOUT = (5, 30)
+# Retry policy for transient API errors, shared by the requests and httpx paths
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.2
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Above this many threads, fetch with httpx over HTTP/2 when it is installed
+ASYNC_FETCH_THRESHOLD = 4
+# Characters not allowed in output filenames (\w is str.isalnum() plus "_")
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w-]")
+
+
+def create_session(pool_size: int = DEFAULT_CONCURRENCY) -> "requests.Session":
+    """Create a requests session that keeps connections alive and retries transient errors.
+    pool_size should match the number of concurrent downloads; the pool blocks rather
+    than opening throwaway connections beyond it. requests already asks for gzip
+    (and br/zstd when their decoders are installed) and keeps connections alive."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # raise_on_status=False hands the final response back so raise_for_status() reports it
+    retries = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR,
+                    status_forcelist=RETRY_STATUS_CODES, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          pool_block=True, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared across all API calls so the TCP/TLS connection is reused
+_SESSION: Optional["requests.Session"] = None
+
+
+def get_session(pool_size: Optional[int] = None) -> "requests.Session":
+    """Return the shared session, creating it on first use.
+    pool_size only applies to that first call."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = create_session(pool_size or DEFAULT_CONCURRENCY)
+    return _SESSION
+
+
+def _config_cache_pattern(config_path: str) -> str:
+    """Glob pattern matching all parsed-config cache files for config_path."""
+    config_dir, config_file = os.path.split(config_path)
+    name = os.path.splitext(config_file)[0]
+    return os.path.join(config_dir, f".{name}.cache.*.pkl")
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
-    """Load YAML config file from the given path."""
+    """Load YAML config file from the given path.
+    The parsed result is cached next to the config file, keyed by its mtime and size,
+    so repeated runs skip YAML parsing until the config changes."""
+    import glob
+    import pickle
+
+    st = os.stat(config_path)
+    pattern = _config_cache_pattern(config_path)
+    cache_path = pattern.replace("*", f"{st.st_mtime_ns}_{st.st_size}")
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        # The cache is only an optimization; a missing or corrupt one (which can
+        # raise ValueError, OverflowError, MemoryError, ...) just means re-parsing
+        if not isinstance(e, FileNotFoundError):
+            import logging
+
+            logging.debug(f"Ignoring unreadable config cache {cache_path}: {e}")
+
+    import yaml
+    try:
+        # libyaml C bindings are much faster than the pure-Python loader
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        config = yaml.load(f.read(), Loader=Loader)
+
+    for stale_path in glob.glob(pattern):
+        try:
+            os.unlink(stale_path)
+        except OSError:
+            pass
+    # The config holds secret keys, so keep the cache private to the user.
+    # Write to a temp file and rename so concurrent runs never read a partial cache.
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        import logging
+
+        logging.debug(f"Unable to write config cache {cache_path}: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    return config
+
+
+# id(projects) -> (projects, {full_key: full_key}, {name: full_key}).
+# Holding the projects dict keeps its id from being reused while cached.
+_project_index_cache: Dict[int, Tuple[Dict[str, Any], Dict[str, str], Dict[str, str]]] = {}
 
 
-def get_project_key_from_config(config: Dict[str, Any], project_id: Optional[str], project_name: Optional[str]) -> Tuple[str, str]:
-    """Get the secret key and project display name from config based on project_id or project_name.
+def _project_index(projects: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Return (by_key, by_name) lookup tables for the projects dict, building them once."""
+    entry = _project_index_cache.get(id(projects))
+    if entry is None or entry[0] is not projects:
+        by_key = {k: k for k in projects}
+        by_name: Dict[str, str] = {}
+        for k in projects:
+            # First project wins when several share a name, as with a linear scan
+            by_name.setdefault(k.split(':', 1)[0], k)
+        entry = (projects, by_key, by_name)
+        _project_index_cache[id(projects)] = entry
+    return entry[1], entry[2]
+
+
+def get_project_key_from_config(projects: Dict[str, Any], project_id: Optional[str], project_name: Optional[str]) -> Tuple[str, str]:
+    """Get the secret key and project display name based on project_id or project_name.
+    projects is the config's promptql_secret_keys mapping.
     Removes any colon and suffix from project_name for matching."""
-    projects = config.get('promptql_secret_keys', {})
-    for k, v in projects.items():
-        name, *_ = k.split(':', 1)
+    by_key, by_name = _project_index(projects)
+    full_key = by_key.get(project_id) if project_id else None
+    if full_key is None and project_name:
         # Remove any colon and suffix from project_name for matching
-        cleaned_project_name = project_name.split(
-            ':', 1)[0] if project_name else None
-        if (project_id and project_id == k) or (cleaned_project_name and cleaned_project_name == name):
-            return v, k
-    return None, None
+        full_key = by_name.get(project_name.split(':', 1)[0])
+    if full_key is None:
+        return None, None
+    return projects[full_key], full_key
 
 
-def prompt_for_project(config: Dict[str, Any]) -> Tuple[str, str]:
-    """Prompt user to select a project from config, return (secret_key, project_key).
+def prompt_for_project(projects: Dict[str, Any]) -> Tuple[str, str]:
+    """Prompt user to select one of the config's projects, return (secret_key, project_key).
     Handles quitting via menu, CTRL-C, or ESC/cancel."""
-    projects = config.get('promptql_secret_keys', {})
+    import questionary
+
     quit_choice = questionary.Choice(title="Quit (q)", value="__QUIT__")
     choices = [questionary.Choice(title=k.split(':', 1)[0], value=k)
                for k in projects.keys()] + [quit_choice]
@@ -67,34 +196,276 @@ def prompt_for_project(config: Dict[str, Any]) -> Tuple[str, str]:
         return projects[selected], selected
 
 
-def fetch_thread(thread_id: str, api_key: str, base_url: str) -> Dict[str, Any]:
-    """Fetch thread data from the PromptQL API."""
+class ThreadCache:
+    """On-disk cache of thread bodies keyed by thread_id, with the ETag each was served with.
+    Lets repeated runs send conditional requests and skip re-writing unchanged threads.
+    Safe to use from multiple worker threads."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        import json
+        import threading
+
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self._index_path = os.path.join(self.cache_dir, "etags.json")
+        self._lock = threading.Lock()
+        self._unchanged = set()
+        try:
+            with open(self._index_path, 'r') as f:
+                self._entries: Dict[str, Dict[str, str]] = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _body_path(self, thread_id: str) -> str:
+        from urllib.parse import quote
+
+        # Bodies live in their own directory so no thread_id can collide with etags.json
+        return os.path.join(self.cache_dir, "bodies", f"{quote(thread_id, safe='')}.json")
+
+    def conditional_headers(self, thread_id: str) -> Dict[str, str]:
+        """Return If-None-Match headers for thread_id if a cached body is available."""
+        with self._lock:
+            etag = self._entries.get(thread_id, {}).get("etag")
+        if etag and os.path.exists(self._body_path(thread_id)):
+            return {"If-None-Match": etag}
+        return {}
+
+    def load_unchanged(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached body after a 304 response and remember the thread as unchanged.
+        Returns None and forgets the entry if the cached body is missing or unreadable,
+        so the caller can fetch the thread again without If-None-Match."""
+        import json
+
+        try:
+            with open(self._body_path(thread_id), 'rb') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self._entries.pop(thread_id, None)
+            return None
+        with self._lock:
+            self._unchanged.add(thread_id)
+        return data
+
+    def _write_private(self, path: str, payload: bytes) -> None:
+        """Atomically write payload to path, readable only by the user.
+        Thread transcripts are as private as the config, so the cache directory
+        is created 0700 and its files 0600 regardless of the umask."""
+        import threading
+
+        # makedirs only applies mode to the leaf, so create each level explicitly
+        for directory in (self.cache_dir, os.path.dirname(path)):
+            if not os.path.isdir(directory):
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Write to a temp file and rename so an interrupted write never leaves a truncated file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def store(self, thread_id: str, etag: Optional[str], data: Dict[str, Any]) -> None:
+        """Cache a freshly fetched body. Responses without an ETag are not cached.
+        Failing to write the cache never fails the export; the thread just isn't cached."""
+        if not etag:
+            return
+        body_path = self._body_path(thread_id)
+        try:
+            self._write_private(body_path, dump_json(data))
+        except OSError as e:
+            import logging
+
+            logging.debug(f"Unable to write thread cache {body_path}: {e}")
+            return
+        with self._lock:
+            self._entries[thread_id] = {"etag": etag}
+
+    def is_unchanged(self, thread_id: str) -> bool:
+        """True if thread_id was served from the cache (304) during this run."""
+        with self._lock:
+            return thread_id in self._unchanged
+
+    def last_export(self, thread_id: str) -> Optional[str]:
+        """Path the thread was last exported to, if known."""
+        with self._lock:
+            return self._entries.get(thread_id, {}).get("export")
+
+    def record_export(self, thread_id: str, filepath: str) -> None:
+        with self._lock:
+            if thread_id in self._entries:
+                self._entries[thread_id]["export"] = os.path.abspath(filepath)
+
+    def save(self) -> None:
+        """Persist the ETag index. Write failures are logged and otherwise ignored."""
+        import json
+
+        with self._lock:
+            payload = json.dumps(self._entries)
+        try:
+            self._write_private(self._index_path, payload.encode())
+        except OSError as e:
+            import logging
+
+            logging.debug(f"Unable to write thread cache index {self._index_path}: {e}")
+
+
+@functools.lru_cache(maxsize=4)
+def _make_headers(api_key: str) -> Dict[str, str]:
+    """Request headers for api_key, built once per key.
+    The returned dict is shared between calls and must not be modified."""
+    return {"Authorization": f"api-key {api_key}",
+            "Content-Type": "application/json"}
+
+
+def fetch_thread(thread_id: str, api_key: str, base_url: str, session: Optional["requests.Session"] = None,
+                 cache: Optional[ThreadCache] = None) -> Dict[str, Any]:
+    """Fetch thread data from the PromptQL API.
+    Uses the shared module session unless one is given. With a cache, sends
+    If-None-Match and returns the cached body when the server answers 304."""
     if not thread_id.strip() or not api_key.strip():
         raise ValueError("Thread ID and API key must be non-empty strings.")
     url = f"{base_url}/playground/threads/{thread_id}"
-    headers = {"Authorization": f"api-key {api_key}",
-               "Content-Type": "application/json"}
-    response = requests.get(url, headers=headers)
+    headers = _make_headers(api_key)
+    if cache is not None:
+        headers = {**headers, **cache.conditional_headers(thread_id)}
+    session = session or get_session()
+    response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if cache is not None and response.status_code == 304:
+        data = cache.load_unchanged(thread_id)
+        if data is not None:
+            return data
+        # The cached body is unusable, so fetch the thread unconditionally
+        headers = _make_headers(api_key)
+        response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    data = response.json()
+    if cache is not None:
+        cache.store(thread_id, response.headers.get("ETag"), data)
+    return data
 
 
-def fetch_thread_list(api_key: str, base_url: str) -> List[Dict[str, Any]]:
-    """Fetch a list of threads from the PromptQL API."""
+def fetch_thread_list(api_key: str, base_url: str, session: Optional["requests.Session"] = None) -> List[Dict[str, Any]]:
+    """Fetch a list of threads from the PromptQL API.
+    Uses the shared module session unless one is given."""
     url = f"{base_url}/playground/threads"
-    headers = {"Authorization": f"api-key {api_key}",
-               "Content-Type": "application/json"}
-    response = requests.get(url, headers=headers)
+    headers = _make_headers(api_key)
+    session = session or get_session()
+    response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     return response.json()
 
 
-def select_threads(threads: List[Dict[str, Any]], select_ids: Optional[List[str]] = None, base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+def httpx_available() -> bool:
+    """Return True if the optional httpx dependency is installed."""
+    import importlib.util
+
+    return importlib.util.find_spec("httpx") is not None
+
+
+def retry_backoff(retry_number: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the given retry (1-based), matching urllib3's Retry:
+    a numeric Retry-After header wins, the first retry is immediate, and later ones
+    back off exponentially by RETRY_BACKOFF_FACTOR."""
+    if retry_after and retry_after.strip().isdigit():
+        return float(retry_after)
+    if retry_number <= 1:
+        return 0.0
+    return min(RETRY_BACKOFF_FACTOR * 2 ** (retry_number - 1), 120.0)
+
+
+def _httpx_verify() -> Any:
+    """TLS verification setting for httpx that honours the CA bundle requests would use.
+    httpx itself only reads SSL_CERT_FILE/SSL_CERT_DIR."""
+    ca_bundle = os.environ.get(
+        "REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE")
+    if not ca_bundle:
+        return True
+    import ssl
+
+    if os.path.isdir(ca_bundle):
+        return ssl.create_default_context(capath=ca_bundle)
+    return ssl.create_default_context(cafile=ca_bundle)
+
+
+async def fetch_threads_async(thread_ids: List[str], api_key: str, base_url: str, max_concurrency: int = DEFAULT_CONCURRENCY,
+                              client: Optional["httpx.AsyncClient"] = None, cache: Optional[ThreadCache] = None) -> List[Dict[str, Any]]:
+    """Fetch several threads concurrently with httpx, multiplexed over HTTP/2 when h2 is installed.
+    Returns the thread data in the same order as thread_ids. The cache is used as in fetch_thread."""
+    import asyncio
+    import importlib.util
+
+    import httpx
+
+    if not api_key.strip() or not all(i.strip() for i in thread_ids):
+        raise ValueError("Thread IDs and API key must be non-empty strings.")
+    headers = _make_headers(api_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def get(c: "httpx.AsyncClient", url: str, request_headers: Dict[str, str]) -> "httpx.Response":
+        # Retry failed connections and 429/5xx responses like create_session's Retry does
+        for retry_number in range(RETRY_TOTAL + 1):
+            try:
+                async with semaphore:
+                    response = await c.get(url, headers=request_headers)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if retry_number == RETRY_TOTAL:
+                    raise
+                await asyncio.sleep(retry_backoff(retry_number + 1))
+                continue
+            if response.status_code not in RETRY_STATUS_CODES or retry_number == RETRY_TOTAL:
+                return response
+            retry_after = response.headers.get(
+                "Retry-After") if response.status_code in (429, 503) else None
+            await asyncio.sleep(retry_backoff(retry_number + 1, retry_after))
+        return response
+
+    async def fetch(c: "httpx.AsyncClient", thread_id: str) -> Dict[str, Any]:
+        request_headers = headers
+        if cache is not None:
+            conditional = await asyncio.to_thread(cache.conditional_headers, thread_id)
+            request_headers = {**headers, **conditional}
+        url = f"{base_url}/playground/threads/{thread_id}"
+        response = await get(c, url, request_headers)
+        if cache is not None and response.status_code == 304:
+            # Cache reads and writes block on disk, so keep them off the event loop
+            data = await asyncio.to_thread(cache.load_unchanged, thread_id)
+            if data is not None:
+                return data
+            # The cached body is unusable, so fetch the thread unconditionally
+            response = await get(c, url, headers)
+        response.raise_for_status()
+        data = response.json()
+        if cache is not None:
+            await asyncio.to_thread(cache.store, thread_id, response.headers.get("ETag"), data)
+        return data
+
+    if client is not None:
+        return await asyncio.gather(*(fetch(client, i) for i in thread_ids))
+    http2 = importlib.util.find_spec("h2") is not None
+    timeout = httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0])
+    limits = httpx.Limits(max_connections=max_concurrency,
+                          max_keepalive_connections=max_concurrency)
+    # No explicit transport, so httpx still honours HTTP(S)_PROXY/NO_PROXY like requests does
+    async with httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout, verify=_httpx_verify()) as c:
+        return await asyncio.gather(*(fetch(c, i) for i in thread_ids))
+
+
+def select_threads(threads: List[Dict[str, Any]], select_ids: Optional[Iterable[str]] = None, base_url: Optional[str] = None) -> List[Dict[str, Any]]:
     """Select threads by IDs or interactively with checkboxes.
     Handles quitting via menu, CTRL-C, or ESC/cancel."""
     if select_ids:
-        selected = [t for t in threads if t.get("thread_id") in select_ids]
+        # frozenset() returns a frozenset argument as-is, so main() pays no re-conversion
+        id_set = frozenset(select_ids)
+        selected = [t for t in threads if t.get("thread_id") in id_set]
         return selected
+    import questionary
+
     if base_url:
         print(f"\nPromptQL API BASE_URL: {base_url}\n")
     all_threads_choice = questionary.Choice(
@@ -127,7 +498,167 @@ def select_threads(threads: List[Dict[str, Any]], select_ids: Optional[List[str]
             continue
         if "__ALL__" in selected_ids:
             return threads
-        return [t for t in threads if t.get("thread_id") in selected_ids]
+        id_set = frozenset(selected_ids)
+        return [t for t in threads if t.get("thread_id") in id_set]
+
+
+def dump_json(data: Any) -> bytes:
+    """Serialize data to indented JSON bytes, using orjson when it is installed."""
+    import json
+
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder handles these
+            pass
+    return json.dumps(data, indent=4).encode()
+
+
+class FileWriter:
+    """Writes files on a single background thread so download workers don't wait on disk.
+    Messages passed to submit() or report() are printed from the writer thread in
+    queue order, so a file is only reported once it has actually been written.
+    Use as a context manager: leaving the block waits for queued writes and
+    re-raises the first write error, if any."""
+
+    def __init__(self) -> None:
+        import queue
+        import threading
+
+        self._queue: "queue.Queue[Optional[Tuple[Optional[str], bytes, Optional[str]]]]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name="file-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                filepath, payload, message = item
+                if filepath is not None:
+                    with open(filepath, "wb") as f:
+                        f.write(payload)
+                if message is not None:
+                    print(message)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+    def submit(self, filepath: str, payload: bytes, message: Optional[str] = None) -> None:
+        """Queue payload to be written to filepath, printing message once it is written."""
+        self._queue.put((filepath, payload, message))
+
+    def report(self, message: str) -> None:
+        """Queue message to be printed after the writes queued before it."""
+        self._queue.put((None, b"", message))
+
+    def close(self) -> None:
+        """Wait for all queued writes to finish and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "FileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def thread_filename(thread: Dict[str, Any], timestamp: Optional[str] = None, index: Optional[int] = None) -> str:
+    """Output filename for a thread: {title or thread_id}_{timestamp}[_{index}].json.
+    timestamp defaults to the current time."""
+    title = thread.get("title") or thread.get("thread_id")
+    safe_title = UNSAFE_FILENAME_CHARS.sub("_", title)
+    timestamp = timestamp or time.strftime("%Y%m%d_%H%M%S")
+    suffix = f"_{index:04d}" if index is not None else ""
+    return f"{safe_title}_{timestamp}{suffix}.json"
+
+
+def batch_filenames(threads: List[Dict[str, Any]], timestamp: str) -> Dict[str, str]:
+    """Map each thread_id to its output filename for a batch sharing one timestamp.
+    Threads whose names would collide get their position in the batch appended.
+    Names are compared case-insensitively, since macOS and Windows filesystems are."""
+    from collections import Counter
+
+    names = [thread_filename(t, timestamp) for t in threads]
+    counts = Counter(name.casefold() for name in names)
+    return {
+        t.get("thread_id"): thread_filename(t, timestamp, i) if counts[name.casefold()] > 1 else name
+        for i, (t, name) in enumerate(zip(threads, names))
+    }
+
+
+def export_message(title: str, filepath: str, saved: bool) -> str:
+    if saved:
+        return f"Saved thread '{title}' to {filepath}"
+    return f"Thread '{title}' unchanged, already saved at {filepath}"
+
+
+def save_thread(thread: Dict[str, Any], data: Dict[str, Any], output_dir: str, filename: Optional[str] = None,
+                writer: Optional[FileWriter] = None) -> Tuple[str, str]:
+    """Save fetched thread data as JSON in output_dir.
+    filename defaults to thread_filename() with the current time.
+    With a writer, the file is written in the background instead of immediately
+    and the writer reports it once written.
+    Returns (title, filepath) of the saved file."""
+    title = thread.get("title") or thread.get("thread_id")
+    filename = filename or thread_filename(thread)
+    filepath = os.path.join(output_dir, filename)
+    payload = dump_json(data)
+    if writer is not None:
+        writer.submit(filepath, payload, export_message(title, filepath, True))
+    else:
+        with open(filepath, "wb") as f:
+            f.write(payload)
+    return title, filepath
+
+
+def export_thread(thread: Dict[str, Any], data: Dict[str, Any], output_dir: str,
+                  cache: Optional[ThreadCache] = None, filename: Optional[str] = None,
+                  writer: Optional[FileWriter] = None) -> Tuple[str, str, bool]:
+    """Save fetched thread data unless the cache shows it is unchanged and already exported to output_dir.
+    Returns (title, filepath, saved)."""
+    thread_id = thread.get("thread_id")
+    if cache is not None and cache.is_unchanged(thread_id):
+        previous = cache.last_export(thread_id)
+        if previous and os.path.dirname(previous) == os.path.abspath(output_dir) and os.path.exists(previous):
+            return thread.get("title") or thread_id, previous, False
+    title, filepath = save_thread(thread, data, output_dir, filename, writer)
+    if cache is not None:
+        cache.record_export(thread_id, filepath)
+    return title, filepath, True
+
+
+def download_thread(thread: Dict[str, Any], api_key: str, base_url: str, output_dir: str,
+                    cache: Optional[ThreadCache] = None, filename: Optional[str] = None,
+                    writer: Optional[FileWriter] = None) -> Tuple[str, str, bool]:
+    """Fetch a single thread and save it as JSON in output_dir.
+    Returns (title, filepath, saved); see export_thread."""
+    data = fetch_thread(thread.get("thread_id"), api_key,
+                        base_url, cache=cache)
+    return export_thread(thread, data, output_dir, cache, filename, writer)
+
+
+def print_export(title: str, filepath: str, saved: bool, writer: Optional[FileWriter] = None) -> None:
+    """Print the outcome of an export.
+    With a writer, saved files were already queued with their message, so only
+    unchanged threads are reported, queued behind the writes to keep output in order."""
+    if writer is None:
+        print(export_message(title, filepath, saved))
+    elif not saved:
+        writer.report(export_message(title, filepath, saved))
 
 
 def handle_sigint(signum, frame):
@@ -135,13 +666,16 @@ def handle_sigint(signum, frame):
     sys.exit(0)
 
 
-signal.signal(signal.SIGINT, handle_sigint)
+def interactive_disabled() -> bool:
+    """True if PROMPTQL_NO_INTERACTIVE is set, in which case questionary is never imported."""
+    return os.environ.get("PROMPTQL_NO_INTERACTIVE", "") not in ("", "0")
 
 
-def main() -> None:
-    """Main entry point for the CLI script."""
-    load_dotenv()
+def _early_parse(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments before any heavy imports, so --help and --version are instant."""
     parser = argparse.ArgumentParser(description="Fetch PromptQL thread data.")
+    parser.add_argument("--version", action="version",
+                        version=f"%(prog)s {__version__}")
     parser.add_argument("--api-key", required=False, type=str,
                         help="API key for PromptQL (overrides config and env)")
     parser.add_argument("--project-name", required=False,
@@ -152,14 +686,43 @@ def main() -> None:
                         help="Comma-separated thread IDs to select (optional)")
     parser.add_argument("--output-dir", type=str,
                         help="Directory to save thread files (optional)")
-    args = parser.parse_args()
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Number of threads to download in parallel; parallel downloads share one HTTP "
+                             "connection pool sized to match (default: PROMPTQL_CONCURRENCY env var, "
+                             f"else min(32, 4 x CPU count) = {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Always re-download threads instead of using the ETag cache in {DEFAULT_CACHE_DIR}")
+    return parser.parse_args(argv)
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Export threads according to the parsed command-line arguments."""
+    import logging
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    logging.basicConfig(level=logging.ERROR)
+    # Signal handlers can only be installed from the main thread
+    if threading.current_thread() is threading.main_thread():
+        import signal
+
+        signal.signal(signal.SIGINT, handle_sigint)
+
+    import requests
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
-    base_url = os.environ.get("BASE_URL") or "https://promptql.ddn.hasura.app"
+    # Normalized once here so request URLs are built by plain concatenation
+    base_url = (os.environ.get("BASE_URL")
+                or "https://promptql.ddn.hasura.app").rstrip("/")
     config_path = os.path.expanduser("~/.ddn/config.yaml")
     if not os.path.exists(config_path):
         print(f"Error: Config file not found at {config_path}")
         sys.exit(1)
     config = load_config(config_path)
+    # Read the project secret keys once; the helpers below take them directly
+    projects = config.get('promptql_secret_keys') or {}
 
     # API key selection logic: CLI flag > ENV > config.yaml
     api_key = args.api_key or os.environ.get("API_KEY")
@@ -168,18 +731,36 @@ def main() -> None:
         # Project selection logic (only if API key not provided)
         if args.project_id or args.project_name:
             api_key, project_key = get_project_key_from_config(
-                config, args.project_id, args.project_name)
+                projects, args.project_id, args.project_name)
             if not api_key:
                 print(
                     "Error: Project not found in config for the given --project-id or --project-name.")
                 sys.exit(1)
+        elif interactive_disabled():
+            print("Error: PROMPTQL_NO_INTERACTIVE is set; pass --api-key, --project-id or --project-name.")
+            sys.exit(1)
         else:
-            api_key, project_key = prompt_for_project(config)
+            api_key, project_key = prompt_for_project(projects)
     # If api_key is still None after all attempts, error out
     if not api_key:
         print("Error: No API key provided via --api-key, API_KEY env var, or config.yaml.")
         sys.exit(1)
 
+    # Resolved after load_dotenv() so PROMPTQL_CONCURRENCY can also come from .env
+    max_workers = args.jobs
+    if max_workers is None:
+        try:
+            max_workers = int(os.environ.get(
+                "PROMPTQL_CONCURRENCY", DEFAULT_CONCURRENCY))
+        except ValueError:
+            print("Error: PROMPTQL_CONCURRENCY must be an integer.")
+            sys.exit(1)
+    if max_workers < 1:
+        print("Error: --jobs (or PROMPTQL_CONCURRENCY) must be at least 1.")
+        sys.exit(1)
+    # Size the connection pool to the number of concurrent downloads
+    get_session(max_workers)
+
     try:
         try:
             threads = fetch_thread_list(api_key, base_url)
@@ -191,28 +772,63 @@ def main() -> None:
             print(
                 "Error: No threads found. This may indicate an incorrect API key or BASE_URL.")
             sys.exit(1)
-        select_ids = [tid.strip()
-                      for tid in args.select.split(",")] if args.select else None
-        selected_threads = select_threads(threads, select_ids, base_url)
+        select_ids = frozenset(tid.strip()
+                               for tid in args.select.split(",")) if args.select else None
+        if select_ids is None and interactive_disabled():
+            # Nothing to prompt with, so export every thread
+            selected_threads = threads
+        else:
+            selected_threads = select_threads(threads, select_ids, base_url)
         output_dir = args.output_dir or os.path.join(
             os.getcwd(), DEFAULT_OUTPUT_DIR)
-        os.makedirs(output_dir, exist_ok=True)
-        for thread in selected_threads:
-            thread_id = thread.get("thread_id")
-            title = thread.get("title") or thread_id
-            safe_title = "".join(c if c.isalnum() or c in (
-                "-_") else "_" for c in title)
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"{safe_title}_{timestamp}.json"
-            filepath = os.path.join(output_dir, filename)
-            data = fetch_thread(thread_id, api_key, base_url)
-            with open(filepath, "w") as f:
-                json.dump(data, f, indent=4)
-            print(f"Saved thread '{title}' to {filepath}")
+        # A stat is cheaper than mkdir on the common path where the directory exists
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+
+        cache = None if args.no_cache else ThreadCache()
+        # All files from one run share the batch's timestamp
+        filenames = batch_filenames(
+            selected_threads, time.strftime("%Y%m%d_%H%M%S"))
+
+        def download(thread: Dict[str, Any]) -> Tuple[str, str, bool]:
+            filename = filenames[thread.get("thread_id")]
+            return download_thread(thread, api_key, base_url, output_dir, cache, filename, writer)
+
+        def export(thread: Dict[str, Any], data: Dict[str, Any]) -> Tuple[str, str, bool]:
+            filename = filenames[thread.get("thread_id")]
+            return export_thread(thread, data, output_dir, cache, filename, writer)
+
+        # Files are written by one background thread so fetches overlap with disk I/O
+        with FileWriter() as writer:
+            if len(selected_threads) == 1 or max_workers == 1:
+                for thread in selected_threads:
+                    print_export(*download(thread), writer)
+            elif len(selected_threads) > ASYNC_FETCH_THRESHOLD and httpx_available():
+                import asyncio
+
+                thread_ids = [t.get("thread_id") for t in selected_threads]
+                thread_data = asyncio.run(fetch_threads_async(
+                    thread_ids, api_key, base_url, max_workers, cache=cache))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for result in executor.map(export, selected_threads, thread_data):
+                        print_export(*result, writer)
+            else:
+                # Thread downloads are independent HTTP calls, so fetch them concurrently.
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for result in executor.map(download, selected_threads):
+                        print_export(*result, writer)
+        # Only record exports once every file has been written
+        if cache is not None:
+            cache.save()
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         raise
 
 
+def main() -> None:
+    """Main entry point for the CLI script."""
+    _run(_early_parse())
+
+
 if __name__ == "__main__":
     main()
@@ -1,10 +1,21 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from typing import Dict, Any
 
 import requests
 
-from main import fetch_thread
+from main import (ASYNC_FETCH_THRESHOLD, REQUEST_TIMEOUT, FileWriter,
+                  ThreadCache, _early_parse, _httpx_verify, _run,
+                  batch_filenames, create_session, download_thread, dump_json,
+                  fetch_thread, fetch_thread_list, fetch_threads_async,
+                  get_project_key_from_config, load_config, retry_backoff,
+                  save_thread, select_threads, thread_filename)
 
 
 @pytest.fixture
@@ -17,15 +28,46 @@ def mock_response() -> MagicMock:
 
 def test_fetch_thread_success(mock_response: MagicMock) -> None:
     """Test successful API fetch."""
-    with patch("requests.get", return_value=mock_response) as mock_get:
-        result = fetch_thread("test_id", "test_token",
-                              "https://promptql.ddn.hasura.app")
-        assert result == {"key": "value"}
-        mock_get.assert_called_once_with(
-            "https://promptql.ddn.hasura.app/playground/threads/test_id",
-            headers={"Authorization": "api-key test_token",
-                     "Content-Type": "application/json"}
-        )
+    session = MagicMock()
+    session.get.return_value = mock_response
+    result = fetch_thread("test_id", "test_token",
+                          "https://promptql.ddn.hasura.app", session=session)
+    assert result == {"key": "value"}
+    session.get.assert_called_once_with(
+        "https://promptql.ddn.hasura.app/playground/threads/test_id",
+        headers={"Authorization": "api-key test_token",
+                 "Content-Type": "application/json"},
+        timeout=REQUEST_TIMEOUT
+    )
+
+
+def test_fetch_thread_uses_shared_session(mock_response: MagicMock) -> None:
+    """Test that the shared session is used when none is given."""
+    with patch("main._SESSION") as mock_session:
+        mock_session.get.return_value = mock_response
+        assert fetch_thread("test_id", "test_token",
+                            "https://promptql.ddn.hasura.app") == {"key": "value"}
+        mock_session.get.assert_called_once()
+
+
+def test_fetch_thread_list_reuses_headers(mock_response: MagicMock) -> None:
+    """Test that request headers are built once per API key."""
+    session = MagicMock()
+    session.get.return_value = mock_response
+    fetch_thread_list("test_token", "https://promptql.ddn.hasura.app", session=session)
+    fetch_thread_list("test_token", "https://promptql.ddn.hasura.app", session=session)
+    first, second = session.get.call_args_list
+    assert first.kwargs["headers"] is second.kwargs["headers"]
+    assert first.kwargs["headers"] == {"Authorization": "api-key test_token",
+                                       "Content-Type": "application/json"}
+
+
+def test_create_session_pool_matches_concurrency() -> None:
+    """Test that the connection pool is sized to the download concurrency and blocks when full."""
+    adapter = create_session(4).get_adapter("https://promptql.ddn.hasura.app")
+    assert adapter._pool_maxsize == 4
+    assert adapter._pool_block is True
+    assert adapter.max_retries.total == 3
 
 
 def test_fetch_thread_invalid_input() -> None:
@@ -44,7 +86,479 @@ def test_fetch_thread_http_error() -> None:
     mock_error_response.raise_for_status.side_effect = requests.HTTPError(
         "Not found")
 
-    with patch("requests.get", return_value=mock_error_response):
-        with pytest.raises(requests.HTTPError):
-            fetch_thread("test_id", "test_token",
-                         "https://promptql.ddn.hasura.app")
+    session = MagicMock()
+    session.get.return_value = mock_error_response
+    with pytest.raises(requests.HTTPError):
+        fetch_thread("test_id", "test_token",
+                     "https://promptql.ddn.hasura.app", session=session)
+
+
+def test_download_thread_saves_json(tmp_path) -> None:
+    """Test that a downloaded thread is written to the output directory."""
+    thread = {"thread_id": "test_id", "title": "My thread/1"}
+    with patch("main.fetch_thread", return_value={"key": "value"}) as mock_fetch:
+        title, filepath, saved = download_thread(
+            thread, "test_token", "https://promptql.ddn.hasura.app", str(tmp_path))
+    mock_fetch.assert_called_once_with(
+        "test_id", "test_token", "https://promptql.ddn.hasura.app", cache=None)
+    assert title == "My thread/1"
+    assert saved
+    assert os.path.dirname(filepath) == str(tmp_path)
+    assert os.path.basename(filepath).startswith("My_thread_1_")
+    with open(filepath) as f:
+        assert json.load(f) == {"key": "value"}
+
+
+def test_thread_filename_sanitizes_title() -> None:
+    """Test that unsafe title characters are replaced one-for-one in the filename."""
+    assert thread_filename({"thread_id": "test_id", "title": "a b/c:d-é_f"},
+                           "20240101_000000") == "a_b_c_d-é_f_20240101_000000.json"
+
+
+def test_batch_filenames_disambiguates_duplicate_titles() -> None:
+    """Test that only threads whose filenames collide get an index suffix."""
+    threads = [{"thread_id": "a", "title": "Same"}, {"thread_id": "b", "title": "Other"},
+               {"thread_id": "c", "title": "Same"}]
+    assert batch_filenames(threads, "20240101_000000") == {
+        "a": "Same_20240101_000000_0000.json",
+        "b": "Other_20240101_000000.json",
+        "c": "Same_20240101_000000_0002.json",
+    }
+    # Titles differing only in case would overwrite each other on case-insensitive filesystems
+    assert batch_filenames([{"thread_id": "a", "title": "Foo"}, {"thread_id": "b", "title": "foo"}],
+                           "20240101_000000") == {
+        "a": "Foo_20240101_000000_0000.json",
+        "b": "foo_20240101_000000_0001.json",
+    }
+
+
+def test_save_thread_with_writer(tmp_path) -> None:
+    """Test that background writes are complete once the writer is closed."""
+    with FileWriter() as writer:
+        _, filepath = save_thread({"thread_id": "test_id"}, {"key": "value"},
+                                  str(tmp_path), writer=writer)
+    with open(filepath) as f:
+        assert json.load(f) == {"key": "value"}
+
+
+def test_file_writer_reraises_write_errors(tmp_path, capsys) -> None:
+    """Test that a failed background write surfaces when the writer is closed
+    and is never reported as saved."""
+    with pytest.raises(OSError):
+        with FileWriter() as writer:
+            writer.submit(str(tmp_path / "missing" / "file.json"), b"{}", "Saved file")
+    assert "Saved file" not in capsys.readouterr().out
+
+
+def test_download_thread_skips_unchanged_thread(tmp_path) -> None:
+    """Test that a 304 response reuses the cached body and the previous export."""
+    cache = ThreadCache(str(tmp_path / "cache"))
+    output_dir = str(tmp_path / "out")
+    os.makedirs(output_dir)
+    thread = {"thread_id": "test_id", "title": "title"}
+
+    fresh = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+    fresh.json.return_value = {"key": "value"}
+    with patch("main._SESSION") as mock_session:
+        mock_session.get.return_value = fresh
+        _, first_path, saved = download_thread(
+            thread, "test_token", "https://promptql.ddn.hasura.app", output_dir, cache)
+    assert saved
+    cache.save()
+
+    cache = ThreadCache(str(tmp_path / "cache"))
+    with patch("main._SESSION") as mock_session:
+        mock_session.get.return_value = MagicMock(status_code=304)
+        _, second_path, saved = download_thread(
+            thread, "test_token", "https://promptql.ddn.hasura.app", output_dir, cache)
+        assert mock_session.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert not saved
+    assert second_path == first_path
+    assert os.listdir(output_dir) == [os.path.basename(first_path)]
+
+
+def test_thread_cache_files_are_private(tmp_path) -> None:
+    """Test that cached thread bodies and the index are readable only by the user."""
+    import stat
+
+    cache = ThreadCache(str(tmp_path / "cache"))
+    cache.store("test_id", '"v1"', {"key": "value"})
+    cache.save()
+    assert stat.S_IMODE(os.stat(tmp_path / "cache").st_mode) & 0o077 == 0
+    for root, dirs, files in os.walk(tmp_path / "cache"):
+        for name in dirs + files:
+            mode = stat.S_IMODE(os.stat(os.path.join(root, name)).st_mode)
+            assert mode & 0o077 == 0, name
+
+
+def test_thread_cache_body_cannot_overwrite_index(tmp_path) -> None:
+    """Test that a thread whose ID is 'etags' doesn't clobber the ETag index."""
+    cache = ThreadCache(str(tmp_path / "cache"))
+    cache.store("etags", '"v1"', {"key": "value"})
+    cache.save()
+    cache = ThreadCache(str(tmp_path / "cache"))
+    assert cache.conditional_headers("etags") == {"If-None-Match": '"v1"'}
+    assert cache.load_unchanged("etags") == {"key": "value"}
+
+
+def test_download_thread_refetches_when_cached_body_is_damaged(tmp_path) -> None:
+    """Test that a truncated cached body is dropped and the thread fetched again."""
+    cache = ThreadCache(str(tmp_path / "cache"))
+    output_dir = str(tmp_path / "out")
+    os.makedirs(output_dir)
+    thread = {"thread_id": "test_id", "title": "title"}
+
+    fresh = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+    fresh.json.return_value = {"key": "value"}
+    with patch("main._SESSION") as mock_session:
+        mock_session.get.return_value = fresh
+        download_thread(thread, "test_token",
+                        "https://promptql.ddn.hasura.app", output_dir, cache)
+    (tmp_path / "cache" / "bodies" / "test_id.json").write_text('{"key": ')
+
+    with patch("main._SESSION") as mock_session:
+        mock_session.get.side_effect = [MagicMock(status_code=304), fresh]
+        _, filepath, saved = download_thread(
+            thread, "test_token", "https://promptql.ddn.hasura.app", output_dir, cache)
+        retry_headers = mock_session.get.call_args_list[1].kwargs["headers"]
+    assert "If-None-Match" not in retry_headers
+    assert saved
+    with open(filepath) as f:
+        assert json.load(f) == {"key": "value"}
+    with open(tmp_path / "cache" / "bodies" / "test_id.json") as f:
+        assert json.load(f) == {"key": "value"}
+
+
+def test_download_thread_ignores_unwritable_cache(tmp_path) -> None:
+    """Test that a cache directory that can't be created doesn't stop the export."""
+    cache_path = tmp_path / "cache"
+    cache_path.write_text("not a directory")
+    cache = ThreadCache(str(cache_path))
+    output_dir = str(tmp_path / "out")
+    os.makedirs(output_dir)
+
+    fresh = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+    fresh.json.return_value = {"key": "value"}
+    with patch("main._SESSION") as mock_session:
+        mock_session.get.return_value = fresh
+        _, filepath, saved = download_thread(
+            {"thread_id": "test_id", "title": "title"}, "test_token",
+            "https://promptql.ddn.hasura.app", output_dir, cache)
+    cache.save()
+    assert saved
+    with open(filepath) as f:
+        assert json.load(f) == {"key": "value"}
+    assert cache.conditional_headers("test_id") == {}
+
+
+def test_load_config_uses_cache_until_config_changes(tmp_path) -> None:
+    """Test that the parsed config is cached and refreshed when the file changes."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("promptql_secret_keys:\n  proj:env: key1\n")
+
+    assert load_config(str(config_path)) == {
+        "promptql_secret_keys": {"proj:env": "key1"}}
+    assert len(list(tmp_path.glob(".config.cache.*.pkl"))) == 1
+
+    with patch("yaml.load") as mock_load:
+        assert load_config(str(config_path)) == {
+            "promptql_secret_keys": {"proj:env": "key1"}}
+        mock_load.assert_not_called()
+
+    # A corrupt cache (e.g. an unknown pickle protocol) falls back to parsing the YAML
+    cache_file, = tmp_path.glob(".config.cache.*.pkl")
+    cache_file.write_bytes(b"\x80\x07garbage")
+    assert load_config(str(config_path)) == {
+        "promptql_secret_keys": {"proj:env": "key1"}}
+
+    config_path.write_text("promptql_secret_keys:\n  proj:env: key2-changed\n")
+    assert load_config(str(config_path)) == {
+        "promptql_secret_keys": {"proj:env": "key2-changed"}}
+    assert len(list(tmp_path.glob(".config.cache.*.pkl"))) == 1
+
+
+def test_fetch_threads_async_preserves_order() -> None:
+    """Test concurrent fetching with httpx returns results in request order."""
+    httpx = pytest.importorskip("httpx")
+
+    def handler(request):
+        assert request.headers["Authorization"] == "api-key test_token"
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_threads_async(
+                ["a", "b", "c"], "test_token", "https://promptql.ddn.hasura.app", client=client)
+
+    assert asyncio.run(run()) == [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+
+
+def test_dump_json_without_orjson() -> None:
+    """Test the stdlib fallback when orjson is not installed."""
+    with patch.dict("sys.modules", {"orjson": None}):
+        assert dump_json({"key": "value"}) == b'{\n    "key": "value"\n}'
+
+
+def test_select_threads_by_ids() -> None:
+    """Test selecting threads by ID keeps the thread list order."""
+    threads = [{"thread_id": "a"}, {"thread_id": "b"}, {"thread_id": "c"}]
+    assert select_threads(threads, ["c", "a"]) == [
+        {"thread_id": "a"}, {"thread_id": "c"}]
+    assert select_threads(threads, frozenset({"b"})) == [{"thread_id": "b"}]
+
+
+def test_get_project_key_from_config() -> None:
+    """Test project lookup by full key and by name with or without a suffix."""
+    projects = {"blue-urchin:local": "key1", "terrier:local": "key2"}
+    assert get_project_key_from_config(projects, "terrier:local", None) == (
+        "key2", "terrier:local")
+    assert get_project_key_from_config(projects, None, "blue-urchin") == (
+        "key1", "blue-urchin:local")
+    assert get_project_key_from_config(projects, None, "blue-urchin:other") == (
+        "key1", "blue-urchin:local")
+    assert get_project_key_from_config(projects, "missing", None) == (None, None)
+
+
+def test_early_parse_jobs() -> None:
+    """Test the --jobs flag; its default is resolved later from the environment."""
+    assert _early_parse(["--jobs", "3"]).jobs == 3
+    assert _early_parse(["-j", "1"]).jobs == 1
+    assert _early_parse([]).jobs is None
+
+
+def test_help_skips_heavy_imports() -> None:
+    """Test that --help is handled before requests, yaml, questionary or dotenv are imported."""
+    code = (
+        "import sys, main\n"
+        "try:\n"
+        "    main._early_parse(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('loaded:' + ','.join(m for m in ('requests', 'yaml', 'questionary', 'dotenv') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
+    assert result.stdout.strip().splitlines()[-1] == "loaded:"
+
+
+def test_fetch_threads_async_retries_transient_errors() -> None:
+    """Test that the httpx path retries 429/5xx responses like the requests session does."""
+    httpx = pytest.importorskip("httpx")
+    attempts = {"a": 0, "b": 0}
+
+    def handler(request):
+        thread_id = request.url.path.rsplit("/", 1)[-1]
+        attempts[thread_id] += 1
+        if thread_id == "a" and attempts["a"] < 3:
+            return httpx.Response(503)
+        if thread_id == "b":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"id": thread_id})
+
+    async def run(thread_ids):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_threads_async(
+                thread_ids, "test_token", "https://promptql.ddn.hasura.app", client=client)
+
+    with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        assert asyncio.run(run(["a"])) == [{"id": "a"}]
+        assert attempts["a"] == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [
+            retry_backoff(1), retry_backoff(2)]
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run(["b"]))
+        # One initial attempt plus RETRY_TOTAL retries, the same as create_session
+        assert attempts["b"] == 4
+
+
+def test_fetch_threads_async_retries_connect_errors() -> None:
+    """Test that failed connections are retried now that no retrying transport is used."""
+    httpx = pytest.importorskip("httpx")
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"id": "a"})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_threads_async(
+                ["a"], "test_token", "https://promptql.ddn.hasura.app", client=client)
+
+    with patch("asyncio.sleep", new=AsyncMock()):
+        assert asyncio.run(run()) == [{"id": "a"}]
+    assert len(attempts) == 3
+
+
+def test_httpx_verify_uses_requests_ca_bundle(monkeypatch) -> None:
+    """Test that REQUESTS_CA_BUNDLE is applied to the httpx path too."""
+    import ssl
+
+    import certifi
+
+    monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+    monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+    assert _httpx_verify() is True
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", certifi.where())
+    assert isinstance(_httpx_verify(), ssl.SSLContext)
+
+
+def test_fetch_threads_async_uses_cache_off_the_event_loop(tmp_path) -> None:
+    """Test conditional fetches on the httpx path, with cache I/O run in worker threads."""
+    httpx = pytest.importorskip("httpx")
+    cache = ThreadCache(str(tmp_path / "cache"))
+    cache.store("a", '"v1"', {"id": "a"})
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"id": "b"}, headers={"ETag": '"v2"'})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_threads_async(
+                ["a", "b"], "test_token", "https://promptql.ddn.hasura.app", client=client, cache=cache)
+
+    with patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+        assert asyncio.run(run()) == [{"id": "a"}, {"id": "b"}]
+    offloaded = {c.args[0].__name__ for c in mock_to_thread.call_args_list}
+    assert {"conditional_headers", "load_unchanged", "store"} <= offloaded
+    assert cache.is_unchanged("a")
+    assert cache.conditional_headers("b") == {"If-None-Match": '"v2"'}
+
+
+@pytest.fixture
+def cli_env(tmp_path, monkeypatch) -> str:
+    """Isolate _run(): HOME with a config in tmp_path, no .env/env overrides, no SIGINT handler.
+    Returns the output directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    for name in ("API_KEY", "PROMPTQL_CONCURRENCY", "PROMPTQL_NO_INTERACTIVE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("BASE_URL", "https://promptql.ddn.hasura.app")
+    (tmp_path / ".ddn").mkdir()
+    (tmp_path / ".ddn" / "config.yaml").write_text(
+        "promptql_secret_keys:\n  proj:env: test_token\n")
+    monkeypatch.setattr("dotenv.load_dotenv", lambda *a, **kw: None)
+    monkeypatch.setattr("signal.signal", lambda *a, **kw: None)
+    return str(tmp_path / "out")
+
+
+def _thread_response(url: str, **kwargs) -> MagicMock:
+    response = MagicMock(status_code=200, headers={})
+    response.json.return_value = {"id": url.rsplit("/", 1)[-1]}
+    return response
+
+
+def _exported(output_dir: str) -> Dict[str, str]:
+    """Map thread id -> filename for every exported file."""
+    exported = {}
+    for name in os.listdir(output_dir):
+        with open(os.path.join(output_dir, name)) as f:
+            exported[json.load(f)["id"]] = name
+    return exported
+
+
+def test_run_downloads_with_thread_pool(cli_env: str, capsys) -> None:
+    """Test the requests path: concurrent downloads written through the FileWriter."""
+    threads = [{"thread_id": f"t{i}", "title": "Same"} for i in range(3)]
+    session = MagicMock()
+    session.get.side_effect = _thread_response
+    with patch("main._SESSION", session), \
+            patch("main.fetch_thread_list", return_value=threads), \
+            patch("main.httpx_available", return_value=False), \
+            patch("main.FileWriter", wraps=FileWriter) as mock_writer:
+        _run(_early_parse(["--project-id", "proj:env", "--select", "t0,t1,t2",
+                           "--output-dir", cli_env, "-j", "2"]))
+    mock_writer.assert_called_once()
+    assert session.get.call_count == 3
+    exported = _exported(cli_env)
+    assert sorted(exported) == ["t0", "t1", "t2"]
+    # Same-title threads are kept apart by their position in the batch
+    assert exported["t1"].endswith("_0001.json")
+    # Each file is reported once, by the writer after it has been written
+    assert capsys.readouterr().out.count("Saved thread 'Same'") == 3
+
+
+def mock_client_factory(httpx, handler):
+    """Stand-in for httpx.AsyncClient that serves requests from handler via MockTransport."""
+    real_client = httpx.AsyncClient
+
+    def make_client(**kwargs):
+        kwargs.pop("http2", None)
+        kwargs.pop("limits", None)
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return make_client
+
+
+def test_run_downloads_with_httpx_above_threshold(cli_env: str) -> None:
+    """Test that a batch above ASYNC_FETCH_THRESHOLD is fetched with httpx."""
+    httpx = pytest.importorskip("httpx")
+    thread_ids = [f"t{i}" for i in range(ASYNC_FETCH_THRESHOLD + 2)]
+    threads = [{"thread_id": i, "title": i} for i in thread_ids]
+
+    def handler(request):
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+    session = MagicMock()
+    with patch("main._SESSION", session), \
+            patch("main.fetch_thread_list", return_value=threads), \
+            patch("httpx.AsyncClient", mock_client_factory(httpx, handler)):
+        _run(_early_parse(["--api-key", "test_token", "--select", ",".join(thread_ids),
+                           "--output-dir", cli_env, "-j", "4"]))
+    session.get.assert_not_called()
+    assert sorted(_exported(cli_env)) == thread_ids
+
+
+def test_run_non_interactive_exports_all_threads(cli_env: str, monkeypatch) -> None:
+    """Test that PROMPTQL_NO_INTERACTIVE exports every thread without importing questionary."""
+    monkeypatch.setenv("PROMPTQL_NO_INTERACTIVE", "1")
+    threads = [{"thread_id": "t0", "title": "a"}, {"thread_id": "t1", "title": "b"}]
+    session = MagicMock()
+    session.get.side_effect = _thread_response
+    with patch("main._SESSION", session), \
+            patch("main.fetch_thread_list", return_value=threads), \
+            patch("main.httpx_available", return_value=False), \
+            patch.dict("sys.modules", {"questionary": None}):
+        _run(_early_parse(["--project-name", "proj", "--output-dir", cli_env]))
+    assert sorted(_exported(cli_env)) == ["t0", "t1"]
+
+
+def test_fetch_threads_async_honours_env_proxy(monkeypatch) -> None:
+    """Test that the httpx path goes through HTTP_PROXY the way requests does."""
+    pytest.importorskip("httpx")
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    proxied = []
+
+    class ProxyHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # Proxied requests carry the absolute target URL
+            proxied.append(self.path)
+            body = json.dumps({"id": self.path.rsplit("/", 1)[-1]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ProxyHandler)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05},
+                     daemon=True).start()
+    try:
+        for name in ("NO_PROXY", "no_proxy", "ALL_PROXY", "all_proxy", "http_proxy"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("HTTP_PROXY", f"http://127.0.0.1:{server.server_port}")
+        result = asyncio.run(fetch_threads_async(
+            ["a"], "test_token", "http://promptql.invalid"))
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert result == [{"id": "a"}]
+    assert proxied == ["http://promptql.invalid/playground/threads/a"]